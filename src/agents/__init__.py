@@ -5,5 +5,19 @@ AI Agents for PTNutritionAI
 from .base_agent import BaseAIAgent
 from .pt_coach import PTCoachAgent
 from .nutrition_coach import NutritionCoachAgent
+from .errors import (
+    AgentError,
+    AgentNotConfiguredError,
+    CircuitOpenError,
+    ModelCallError,
+    ModelRequestError,
+    ModelTimeoutError,
+    ModelUnavailableError,
+    StructuredResponseError,
+)
 
-__all__ = ['BaseAIAgent', 'PTCoachAgent', 'NutritionCoachAgent']
+__all__ = [
+    'BaseAIAgent', 'PTCoachAgent', 'NutritionCoachAgent',
+    'AgentError', 'AgentNotConfiguredError', 'CircuitOpenError', 'ModelCallError',
+    'ModelRequestError', 'ModelTimeoutError', 'ModelUnavailableError', 'StructuredResponseError',
+]
@@ -2,11 +2,21 @@
 Base agent class for PTNutritionAI AI coaches
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import asyncio
+import json
 import logging
-from openai import AsyncAzureOpenAI
+from openai import AsyncAzureOpenAI, APIStatusError
 from ..core.config import settings
+from .errors import (
+    AgentNotConfiguredError,
+    ModelCallError,
+    ModelRequestError,
+    ModelTimeoutError,
+    ModelUnavailableError,
+    StructuredResponseError,
+)
+from .resilience import call_timeout, fallback_modes, get_circuit_breaker, response_cache
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +43,9 @@ class BaseAIAgent(ABC):
         self.client = AsyncAzureOpenAI(
             api_key=settings.azure_openai_api_key,
             api_version=settings.azure_openai_api_version,
-            azure_endpoint=settings.azure_openai_endpoint
+            azure_endpoint=settings.azure_openai_endpoint,
+            timeout=settings.model_timeout_seconds,
+            max_retries=settings.model_max_retries
         )
     
     @abstractmethod
@@ -91,79 +103,150 @@ class BaseAIAgent(ABC):
         
         return " | ".join(context_parts) if context_parts else "Limited user context available."
     
-    async def get_response(self, user_input: str, include_context: bool = True) -> str:
-        """Get response from the AI agent"""
+    def get_fallback_message(self) -> str:
+        """Template answer used in degraded mode when the model is unavailable"""
+        return (f"{self.get_agent_name()} is temporarily unavailable. "
+                "Please try again in a few minutes.")
+    
+    async def _complete(self, messages: List[Dict[str, str]], max_tokens: int,
+                        timeout: Optional[float] = None) -> str:
+        """Call the deployment with a bounded timeout behind its circuit breaker"""
         if not self.client:
-            return "Sorry, I'm not properly configured. Please check Azure OpenAI settings."
+            raise AgentNotConfiguredError("Azure OpenAI credentials not configured")
+        
+        own_timeout = timeout or settings.model_timeout_seconds
+        timeout = call_timeout(own_timeout)
+        breaker = get_circuit_breaker(self.model_name)
+        breaker.before_call()
         
         try:
-            # Add user message to history
-            self.add_message("user", user_input)
-            
-            # Prepare system message with context
-            system_prompt = self.get_system_prompt()
-            if include_context and self.user_context:
-                system_prompt += f"\n\nUser Context: {self.get_context_summary()}"
-            
-            # Prepare messages for API call
-            messages = [{"role": "system", "content": system_prompt}]
-            
-            # Add recent conversation history
-            for msg in self.conversation_history[-10:]:  # Last 10 messages
-                messages.append({
-                    "role": msg["role"],
-                    "content": msg["content"]
-                })
-            
-            # Call Azure OpenAI
-            response = await self.client.chat.completions.create(
-                model=self.model_name,
-                messages=messages,
-                max_tokens=500,
-                temperature=0.7
+            response = await asyncio.wait_for(
+                self.client.chat.completions.create(
+                    model=self.model_name,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=0.7
+                ),
+                timeout
             )
-            
-            agent_response = response.choices[0].message.content
-            
-            # Add agent response to history
-            self.add_message("assistant", agent_response)
-            
-            logger.info(f"{self.get_agent_name()} provided response to user")
-            return agent_response
-            
+        except asyncio.TimeoutError:
+            # Only a call that used its full timeout says anything about the deployment;
+            # a caller's shorter deadline must not trip the breaker shared by all users
+            if timeout < own_timeout:
+                breaker.release_trial()
+            else:
+                breaker.record_failure()
+            raise ModelTimeoutError(f"{self.model_name} did not respond within {timeout:.1f}s")
+        except asyncio.CancelledError:
+            breaker.release_trial()
+            raise
+        except APIStatusError as e:
+            if e.status_code >= 500 or e.status_code in (408, 429):
+                breaker.record_failure()
+                raise ModelCallError(str(e)) from e
+            # Rejected requests say nothing about deployment health
+            breaker.release_trial()
+            raise ModelRequestError(str(e), status_code=e.status_code) from e
         except Exception as e:
-            error_msg = f"Sorry, I encountered an error: {str(e)}"
+            breaker.record_failure()
+            raise ModelCallError(str(e)) from e
+        
+        breaker.record_success()
+        return response.choices[0].message.content
+    
+    def _fallback(self, cache_key: str, error: ModelUnavailableError, template: Any) -> Tuple[Any, bool]:
+        """Serve a degraded-mode answer or re-raise if no fallback applies.
+        
+        Returns the answer and whether it is a real cached answer rather than the template.
+        """
+        for mode in fallback_modes():
+            if mode == "cache":
+                cached = response_cache.get(cache_key)
+                if cached is not None:
+                    logger.warning(f"{self.get_agent_name()} serving cached answer: {str(error)}")
+                    return cached, True
+            elif mode == "template":
+                logger.warning(f"{self.get_agent_name()} serving template answer: {str(error)}")
+                return template, False
+        raise error
+    
+    async def get_response(self, user_input: str, include_context: bool = True,
+                           timeout: Optional[float] = None) -> str:
+        """Get response from the AI agent"""
+        # Add user message to history
+        self.add_message("user", user_input)
+        
+        # Prepare system message with context
+        system_prompt = self.get_system_prompt()
+        if include_context and self.user_context:
+            system_prompt += f"\n\nUser Context: {self.get_context_summary()}"
+        
+        # Prepare messages for API call
+        messages = [{"role": "system", "content": system_prompt}]
+        
+        # Add recent conversation history
+        for msg in self.conversation_history[-10:]:  # Last 10 messages
+            messages.append({
+                "role": msg["role"],
+                "content": msg["content"]
+            })
+        
+        cache_key = response_cache.key(self.model_name, f"{system_prompt}\n{user_input}")
+        record_answer = True
+        try:
+            agent_response = await self._complete(messages, max_tokens=500, timeout=timeout)
+            response_cache.put(cache_key, agent_response)
+        except ModelUnavailableError as e:
             logger.error(f"{self.get_agent_name()} error: {str(e)}")
-            return error_msg
+            try:
+                agent_response, record_answer = self._fallback(cache_key, e, self.get_fallback_message())
+            except ModelUnavailableError:
+                self.conversation_history.pop()
+                raise
+        except BaseException:
+            self.conversation_history.pop()
+            raise
+        
+        # Template answers stay out of history so they do not leak into later prompts
+        if record_answer:
+            self.add_message("assistant", agent_response)
+        else:
+            self.conversation_history.pop()
+        
+        logger.info(f"{self.get_agent_name()} provided response to user")
+        return agent_response
     
-    async def get_structured_response(self, prompt: str, response_format: Dict[str, Any]) -> Dict[str, Any]:
+    async def get_structured_response(self, prompt: str, response_format: Dict[str, Any],
+                                      timeout: Optional[float] = None) -> Dict[str, Any]:
         """Get a structured response from the agent"""
+        structured_prompt = f"""
+        {self.get_system_prompt()}
+        
+        User Context: {self.get_context_summary()}
+        
+        Request: {prompt}
+        
+        Please respond in the following JSON format:
+        {response_format}
+        """
+        
+        cache_key = response_cache.key(self.model_name, structured_prompt)
         try:
-            structured_prompt = f"""
-            {self.get_system_prompt()}
-            
-            User Context: {self.get_context_summary()}
-            
-            Request: {prompt}
-            
-            Please respond in the following JSON format:
-            {response_format}
-            """
-            
-            response = await self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[{"role": "system", "content": structured_prompt}],
+            content = await self._complete(
+                [{"role": "system", "content": structured_prompt}],
                 max_tokens=800,
-                temperature=0.7
+                timeout=timeout
             )
-            
-            # Try to parse JSON response
-            import json
-            try:
-                return json.loads(response.choices[0].message.content)
-            except json.JSONDecodeError:
-                return {"error": "Failed to parse structured response", "raw_response": response.choices[0].message.content}
-                
-        except Exception as e:
+        except ModelUnavailableError as e:
             logger.error(f"{self.get_agent_name()} structured response error: {str(e)}")
-            return {"error": str(e)}
+            template = {"message": self.get_fallback_message()}
+            answer, _ = self._fallback(cache_key, e, template)
+            return {**answer, "degraded": True}
+        
+        try:
+            result = json.loads(content)
+        except json.JSONDecodeError as e:
+            raise StructuredResponseError("Failed to parse structured response", raw_response=content) from e
+        
+        response_cache.put(cache_key, result)
+        return result
@@ -0,0 +1,50 @@
+"""
+Typed errors raised by PTNutritionAI AI agents
+"""
+from typing import Optional
+
+
+class AgentError(Exception):
+    """Base class for all agent errors"""
+    pass
+
+
+class ModelUnavailableError(AgentError):
+    """The model could not produce an answer; degraded-mode fallbacks apply"""
+    pass
+
+
+class AgentNotConfiguredError(ModelUnavailableError):
+    """Azure OpenAI credentials are missing"""
+    pass
+
+
+class ModelTimeoutError(ModelUnavailableError):
+    """The call exceeded its per-call timeout or the propagated deadline"""
+    pass
+
+
+class CircuitOpenError(ModelUnavailableError):
+    """The circuit breaker for the deployment is open; the call was not attempted"""
+    pass
+
+
+class ModelCallError(ModelUnavailableError):
+    """The provider returned an error for the call"""
+    pass
+
+
+class ModelRequestError(AgentError):
+    """The provider rejected the request (4xx); retrying or falling back cannot help"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class StructuredResponseError(AgentError):
+    """The model answered but the answer was not valid JSON"""
+
+    def __init__(self, message: str, raw_response: Optional[str] = None):
+        super().__init__(message)
+        self.raw_response = raw_response
@@ -1,9 +1,10 @@
 """
 Personal Trainer AI Coach Agent
 """
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from .base_agent import BaseAIAgent
 from ..core.config import settings
+from ..services.exercise_index import exercise_index, parse_equipment, parse_limitations
 
 
 class PTCoachAgent(BaseAIAgent):
@@ -93,7 +94,20 @@ class PTCoachAgent(BaseAIAgent):
             }
         }
         
-        return await self.get_structured_response(prompt, response_format)
+        result = await self.get_structured_response(prompt, response_format)
+        
+        # Swap contraindicated exercises and fill empty days from the local catalog
+        plan = result.get("workout_plan")
+        if isinstance(plan, dict):
+            adjustments = exercise_index.review_plan(
+                plan,
+                injuries=user_profile.get('injuries'),
+                equipment=parse_equipment(user_profile.get('equipment'))
+            )
+            if adjustments:
+                plan["exercise_adjustments"] = adjustments
+        
+        return result
     
     async def analyze_workout_log(self, workout_data: Dict[str, Any]) -> str:
         """Analyze a completed workout and provide feedback"""
@@ -117,20 +131,84 @@ class PTCoachAgent(BaseAIAgent):
         
         return await self.get_response(prompt)
     
-    async def suggest_exercise_modifications(self, exercise: str, limitation: str) -> str:
-        """Suggest modifications for an exercise based on limitations"""
-        
-        prompt = f"""
-        The user needs modifications for the exercise "{exercise}" due to: {limitation}
+    def get_exercise_alternatives(self, exercise: str, limitation: str,
+                                  equipment: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Look up alternatives for an exercise in the local catalog without a model call"""
+        match = exercise_index.find(exercise)
+        if match is None:
+            return None
+        
+        # Equipment named in the limitation ("only dumbbells") overrides the profile
+        available = parse_equipment(limitation)
+        if available is None:
+            available = parse_equipment(equipment or self.user_context.get('equipment'))
+        affected = match.contraindications & parse_limitations(limitation)
+        return {
+            "exercise": match.name,
+            "limitation": limitation,
+            "contraindicated": bool(affected),
+            "affected_areas": sorted(affected),
+            "equipment_available": exercise_index.is_available(match, available),
+            "modification": match.modification,
+            "alternatives": [
+                {"name": alt.name, "how_to": alt.modification}
+                for alt in exercise_index.alternatives(match, limitation, available)
+            ],
+            "equipment_alternatives": [
+                {"name": sub.name, "equipment": sorted(sub.equipment)}
+                for sub in exercise_index.equipment_substitutes(match, available, limitation)
+            ],
+        }
+    
+    async def suggest_exercise_modifications(self, exercise: str, limitation: str,
+                                             include_safety_notes: bool = False) -> str:
+        """Suggest modifications for an exercise based on limitations.
         
-        Please provide:
-        1. 2-3 alternative exercises that target the same muscle groups
-        2. Modifications to make the original exercise more accessible
-        3. Any equipment alternatives if needed
-        4. Safety considerations for their specific limitation
+        Catalog exercises are answered locally; the model is only called for
+        exercises or limitations the catalog does not know, or when safety
+        notes are requested.
         """
-        
-        return await self.get_response(prompt)
+        suggestion = self.get_exercise_alternatives(exercise, limitation)
+        unrecognised_limitation = (bool(limitation and limitation.strip()) and not parse_limitations(limitation)
+                                   and parse_equipment(limitation) is None)
+        if suggestion is None or unrecognised_limitation:
+            prompt = f"""
+            The user needs modifications for the exercise "{exercise}" due to: {limitation}
+            
+            Please provide:
+            1. 2-3 alternative exercises that target the same muscle groups
+            2. Modifications to make the original exercise more accessible
+            3. Any equipment alternatives if needed
+            4. Safety considerations for their specific limitation
+            """
+            
+            return await self.get_response(prompt)
+        
+        lines = [f"Modifications for {suggestion['exercise']} ({limitation}):", "", "Alternative exercises:"]
+        lines += [f"- {alt['name']}: {alt['how_to']}" for alt in suggestion["alternatives"]]
+        
+        lines += ["", "Making the original more accessible:"]
+        if suggestion["contraindicated"]:
+            areas = ", ".join(area.replace("_", " ") for area in suggestion["affected_areas"])
+            lines.append(f"- This exercise loads the {areas}; prefer the alternatives above until cleared.")
+        if not suggestion["equipment_available"]:
+            lines.append("- This exercise needs equipment you don't have; use the equipment alternatives below.")
+        lines.append(f"- {suggestion['modification']}")
+        
+        if suggestion["equipment_alternatives"]:
+            lines += ["", "Equipment alternatives:"]
+            lines += [f"- {sub['name']} ({', '.join(sub['equipment'])})" for sub in suggestion["equipment_alternatives"]]
+        
+        if include_safety_notes:
+            prompt = f"""
+            The user is replacing "{suggestion['exercise']}" because of: {limitation}
+            Suggested alternatives: {', '.join(alt['name'] for alt in suggestion['alternatives'])}
+            
+            In 3-4 sentences, give safety considerations specific to their limitation.
+            """
+            lines += ["", "Safety considerations:", await self.get_response(prompt)]
+        
+        return "\n".join(lines)
     
     async def create_progression_plan(self, current_performance: Dict[str, Any]) -> Dict[str, Any]:
         """Create a progression plan based on current performance"""
@@ -0,0 +1,185 @@
+"""
+Deadlines, circuit breakers and degraded-mode answers for model calls
+"""
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+import copy
+import hashlib
+import logging
+import threading
+import time
+
+from ..core.config import settings
+from .errors import CircuitOpenError, ModelTimeoutError
+
+logger = logging.getLogger(__name__)
+
+# Absolute time.monotonic() deadline for the current request or job
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    """Bound all model calls made inside the block to `seconds` from now.
+
+    Nested scopes can only tighten an outer deadline, never extend it.
+    """
+    if seconds is None:
+        yield
+        return
+    expires_at = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        expires_at = min(expires_at, current)
+    token = _deadline.set(expires_at)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current deadline, or None if there is none"""
+    expires_at = _deadline.get()
+    if expires_at is None:
+        return None
+    return expires_at - time.monotonic()
+
+
+def call_timeout(timeout: Optional[float] = None) -> float:
+    """Per-call timeout capped by the remaining deadline"""
+    timeout = timeout or settings.model_timeout_seconds
+    remaining = remaining_time()
+    if remaining is not None:
+        if remaining <= 0:
+            raise ModelTimeoutError("Deadline exceeded before the model call started")
+        timeout = min(timeout, remaining)
+    return timeout
+
+
+class CircuitBreaker:
+    """Fail fast for a deployment after repeated failures.
+
+    After `failure_threshold` consecutive failures the breaker opens and
+    rejects calls for `recovery_timeout` seconds, then lets a single trial
+    call through (half-open). A success closes it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: Optional[int] = None,
+                 recovery_timeout: Optional[float] = None):
+        self.name = name
+        self.failure_threshold = failure_threshold or settings.circuit_breaker_failure_threshold
+        self.recovery_timeout = recovery_timeout or settings.circuit_breaker_recovery_seconds
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.recovery_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def before_call(self):
+        """Raise CircuitOpenError if the call must not be attempted"""
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+        raise CircuitOpenError(f"Circuit open for deployment '{self.name}'")
+
+    def release_trial(self):
+        """Free the half-open trial slot without counting a success or failure"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.warning(f"Circuit opened for deployment '{self.name}'")
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(deployment: str) -> CircuitBreaker:
+    """Return the shared circuit breaker for a model deployment"""
+    with _breakers_lock:
+        if deployment not in _breakers:
+            _breakers[deployment] = CircuitBreaker(deployment)
+        return _breakers[deployment]
+
+
+def circuit_states() -> Dict[str, str]:
+    """Current breaker state per deployment"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.state for breaker in breakers}
+
+
+def fallback_modes() -> List[str]:
+    """Configured degraded-mode fallbacks, in the order they are tried"""
+    return [mode.strip() for mode in settings.model_fallback.split(",") if mode.strip()]
+
+
+class ResponseCache:
+    """Bounded LRU of the last successful answer per prompt, used when the model is unavailable.
+
+    Entries are copied on the way in and out so cached answers are never shared.
+    """
+
+    def __init__(self, max_size: Optional[int] = None):
+        self.max_size = max_size or settings.model_fallback_cache_size
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(deployment: str, prompt: str) -> str:
+        return hashlib.sha256(f"{deployment}\n{prompt}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return copy.deepcopy(self._entries[key])
+
+    def put(self, key: str, value: Any):
+        # Store a copy so callers editing their result cannot change the cached answer
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+# Global response cache shared by all agents
+response_cache = ResponseCache()
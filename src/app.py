@@ -6,6 +6,8 @@ from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 import os
 
+from .routes.jobs import jobs_bp
+
 # Initialize Flask app
 app = Flask(__name__)
 
@@ -17,6 +19,9 @@ app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 # Initialize extensions
 db = SQLAlchemy(app)
 
+# Register blueprints
+app.register_blueprint(jobs_bp)
+
 @app.route('/')
 def index():
     """Main application route"""
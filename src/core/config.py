@@ -18,6 +18,15 @@ class Settings(BaseSettings):
     azure_openai_api_key: Optional[str] = Field(None, env="AZURE_OPENAI_API_KEY")
     azure_openai_api_version: str = Field("2024-02-15-preview", env="AZURE_OPENAI_API_VERSION")
     
+    # Model call resilience
+    model_timeout_seconds: float = Field(30.0, env="MODEL_TIMEOUT_SECONDS")
+    model_max_retries: int = Field(1, env="MODEL_MAX_RETRIES")
+    circuit_breaker_failure_threshold: int = Field(5, env="CIRCUIT_BREAKER_FAILURE_THRESHOLD")
+    circuit_breaker_recovery_seconds: float = Field(30.0, env="CIRCUIT_BREAKER_RECOVERY_SECONDS")
+    # Comma-separated degraded-mode fallbacks tried in order: "cache", "template"
+    model_fallback: str = Field("", env="MODEL_FALLBACK")
+    model_fallback_cache_size: int = Field(256, env="MODEL_FALLBACK_CACHE_SIZE")
+    
     # Azure AI Foundry Configuration
     ai_foundry_project_name: Optional[str] = Field(None, env="AI_FOUNDRY_PROJECT_NAME")
     ai_foundry_endpoint: Optional[str] = Field(None, env="AI_FOUNDRY_ENDPOINT")
@@ -45,6 +54,14 @@ class Settings(BaseSettings):
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
     
+    # Background job queue
+    job_workers: int = Field(4, env="JOB_WORKERS")
+    job_max_queue_size: int = Field(100, env="JOB_MAX_QUEUE_SIZE")
+    job_max_retries: int = Field(2, env="JOB_MAX_RETRIES")
+    job_retry_backoff_seconds: float = Field(1.0, env="JOB_RETRY_BACKOFF_SECONDS")
+    job_result_ttl_seconds: int = Field(3600, env="JOB_RESULT_TTL_SECONDS")
+    job_timeout_seconds: float = Field(120.0, env="JOB_TIMEOUT_SECONDS")
+    
     # Regional settings
     azure_region: str = Field("westeurope", env="AZURE_REGION")
     
@@ -0,0 +1,104 @@
+"""
+Job routes for asynchronous plan generation
+"""
+from typing import Any, Dict
+
+from flask import Blueprint, request, url_for
+
+from ..agents import NutritionCoachAgent, PTCoachAgent
+from ..agents.resilience import circuit_states
+from ..core.config import settings
+from ..services.job_queue import QueueFullError, job_queue
+
+jobs_bp = Blueprint('jobs', __name__, url_prefix='/jobs')
+
+# Upper bound for long-polling a job via ?wait=<seconds>
+MAX_WAIT_SECONDS = 30.0
+
+# Header carrying the caller's time budget in seconds, propagated as the job deadline
+TIMEOUT_HEADER = 'X-Request-Timeout'
+
+# Smallest job budget a caller may request; shorter budgets cannot fit a model call
+MIN_TIMEOUT_SECONDS = 5.0
+
+
+async def _run_meal_plan(user_profile: Dict[str, Any], user_context: Dict[str, Any]) -> Dict[str, Any]:
+    agent = NutritionCoachAgent()
+    agent.set_user_context(user_context)
+    return await agent.create_meal_plan(user_profile)
+
+
+async def _run_workout_plan(user_profile: Dict[str, Any], user_context: Dict[str, Any]) -> Dict[str, Any]:
+    agent = PTCoachAgent()
+    agent.set_user_context(user_context)
+    return await agent.create_workout_plan(user_profile)
+
+
+async def _run_grocery_list(meal_plan: Dict[str, Any], household_size: int,
+                            user_context: Dict[str, Any]) -> Dict[str, Any]:
+    agent = NutritionCoachAgent()
+    agent.set_user_context(user_context)
+    return await agent.create_grocery_list(meal_plan, household_size)
+
+
+def _submit(kind: str, func, *args):
+    """Queue a job and return the 202 response pointing at its status URL"""
+    # Callers may shorten the job deadline within bounds but never extend it past the configured maximum
+    timeout = request.headers.get(TIMEOUT_HEADER, type=float)
+    if timeout is not None:
+        timeout = min(max(timeout, MIN_TIMEOUT_SECONDS), settings.job_timeout_seconds)
+    try:
+        job_id = job_queue.submit(kind, func, *args, timeout=timeout)
+    except QueueFullError as e:
+        return {"error": str(e)}, 503
+    return {
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": url_for('jobs.get_job', job_id=job_id),
+    }, 202
+
+
+@jobs_bp.route('/meal-plan', methods=['POST'])
+def submit_meal_plan():
+    """Queue meal plan generation"""
+    data = request.get_json(silent=True) or {}
+    return _submit('meal_plan', _run_meal_plan,
+                   data.get('user_profile', {}), data.get('user_context', {}))
+
+
+@jobs_bp.route('/workout-plan', methods=['POST'])
+def submit_workout_plan():
+    """Queue workout plan generation"""
+    data = request.get_json(silent=True) or {}
+    return _submit('workout_plan', _run_workout_plan,
+                   data.get('user_profile', {}), data.get('user_context', {}))
+
+
+@jobs_bp.route('/grocery-list', methods=['POST'])
+def submit_grocery_list():
+    """Queue grocery list generation"""
+    data = request.get_json(silent=True) or {}
+    if 'meal_plan' not in data:
+        return {"error": "meal_plan is required"}, 400
+    try:
+        household_size = int(data.get('household_size', 1))
+    except (TypeError, ValueError):
+        return {"error": "household_size must be an integer"}, 400
+    return _submit('grocery_list', _run_grocery_list,
+                   data['meal_plan'], household_size, data.get('user_context', {}))
+
+
+@jobs_bp.route('/stats')
+def job_stats():
+    """Queue depth, job latency and model circuit breaker states"""
+    return {**job_queue.stats(), "circuit_breakers": circuit_states()}
+
+
+@jobs_bp.route('/<job_id>')
+def get_job(job_id: str):
+    """Poll a job; pass ?wait=<seconds> to block until it completes"""
+    wait = min(request.args.get('wait', 0, type=float), MAX_WAIT_SECONDS)
+    job = job_queue.wait(job_id, wait) if wait > 0 else job_queue.get(job_id)
+    if job is None:
+        return {"error": "Job not found or expired"}, 404
+    return job.to_dict()
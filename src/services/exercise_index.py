@@ -0,0 +1,479 @@
+"""
+Local exercise catalog indexed for instant substitutions
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set
+import re
+
+
+@dataclass(frozen=True)
+class Exercise:
+    """A catalog exercise and the attributes used to find alternatives"""
+    name: str
+    muscle_groups: FrozenSet[str]
+    movement_pattern: str
+    equipment: FrozenSet[str]
+    contraindications: FrozenSet[str] = frozenset()
+    modification: str = ""
+    aliases: FrozenSet[str] = frozenset()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "muscle_groups": sorted(self.muscle_groups),
+            "movement_pattern": self.movement_pattern,
+            "equipment": sorted(self.equipment),
+            "contraindications": sorted(self.contraindications),
+        }
+
+
+def _exercise(name: str, muscles: str, pattern: str, equipment: str, avoid: str = "",
+              modification: str = "", aliases: str = "") -> Exercise:
+    """Build a catalog entry from space-separated tags"""
+    return Exercise(
+        name=name,
+        muscle_groups=frozenset(muscles.split()),
+        movement_pattern=pattern,
+        equipment=frozenset(equipment.split()),
+        contraindications=frozenset(avoid.split()),
+        modification=modification,
+        aliases=frozenset(alias.strip() for alias in aliases.split(",") if alias.strip()),
+    )
+
+
+CATALOG = (
+    # Squat
+    _exercise("Barbell Back Squat", "quads glutes hamstrings core", "squat", "barbell rack", "knee lower_back",
+              "Reduce depth to a box and lighten the load.", "back squat, barbell squat"),
+    _exercise("Goblet Squat", "quads glutes core", "squat", "dumbbell", "knee",
+              "Squat to a bench or box to control depth.", "dumbbell squat, kettlebell goblet squat"),
+    _exercise("Box Squat", "quads glutes hamstrings", "squat", "bench", "",
+              "Use a higher box to shorten the range of motion.", "bench squat, sit to stand"),
+    _exercise("Bodyweight Squat", "quads glutes", "squat", "bodyweight", "knee",
+              "Hold onto a support and squat to a comfortable depth.", "air squat"),
+    _exercise("Wall Sit", "quads glutes", "squat", "bodyweight", "",
+              "Sit higher on the wall and shorten the hold.", ""),
+    _exercise("Leg Press", "quads glutes hamstrings", "squat", "machine", "knee",
+              "Limit the range so knees stay above 90 degrees.", ""),
+    # Hinge
+    _exercise("Barbell Deadlift", "hamstrings glutes lower_back back", "hinge", "barbell", "lower_back",
+              "Pull from blocks to reduce the range of motion.", "deadlift, conventional deadlift"),
+    _exercise("Romanian Deadlift", "hamstrings glutes lower_back", "hinge", "dumbbell barbell", "lower_back",
+              "Stop the hinge at mid-shin and keep the load light.", "rdl, romanian dead lift"),
+    _exercise("Kettlebell Swing", "glutes hamstrings core", "hinge", "kettlebell", "lower_back shoulder",
+              "Use a lighter bell and a shorter swing.", "swing"),
+    _exercise("Glute Bridge", "glutes hamstrings", "hinge", "bodyweight", "",
+              "Keep the range short and squeeze at the top.", "bridge, hip bridge"),
+    _exercise("Hip Thrust", "glutes hamstrings", "hinge", "bench barbell", "",
+              "Start with bodyweight before adding load.", "barbell hip thrust"),
+    _exercise("Cable Pull-Through", "glutes hamstrings", "hinge", "cable", "",
+              "Take a longer stance and a lighter stack.", "pull through"),
+    _exercise("Lying Hamstring Curl", "hamstrings", "hinge", "machine", "",
+              "Use a partial range with a lighter weight.", "leg curl, hamstring curl"),
+    # Lunge
+    _exercise("Walking Lunge", "quads glutes hamstrings", "lunge", "bodyweight dumbbell", "knee hip ankle",
+              "Shorten the stride and hold a support.", "lunge, lunges"),
+    _exercise("Reverse Lunge", "quads glutes", "lunge", "bodyweight", "hip",
+              "Step back a shorter distance and keep a hand on a support.", "back lunge"),
+    _exercise("Bulgarian Split Squat", "quads glutes", "lunge", "bench dumbbell", "knee hip",
+              "Lower the rear foot to the floor to make it a split squat.", "split squat, rear foot elevated split squat"),
+    _exercise("Step-Up", "quads glutes", "lunge", "bench", "knee",
+              "Use a lower step and drive through the heel.", "step up, box step-up"),
+    # Horizontal push
+    _exercise("Barbell Bench Press", "chest triceps shoulders", "horizontal_push", "barbell bench", "shoulder",
+              "Use a closer grip and stop short of the chest.", "bench press"),
+    _exercise("Dumbbell Bench Press", "chest triceps shoulders", "horizontal_push", "dumbbell bench", "shoulder",
+              "Use a neutral grip to ease shoulder strain.", "db bench press, dumbbell press"),
+    _exercise("Floor Press", "chest triceps", "horizontal_push", "dumbbell", "",
+              "The floor limits the range, sparing the shoulder.", "dumbbell floor press"),
+    _exercise("Push-Up", "chest triceps shoulders core", "horizontal_push", "bodyweight", "wrist shoulder",
+              "Elevate the hands on a bench or wall.", "push up, pushup, press-up"),
+    _exercise("Incline Push-Up", "chest triceps", "horizontal_push", "bench", "wrist",
+              "Raise the hands higher to reduce the load.", "incline push up"),
+    _exercise("Machine Chest Press", "chest triceps", "horizontal_push", "machine", "",
+              "Set the handles so the range stays pain free.", "chest press"),
+    _exercise("Band Chest Press", "chest triceps", "horizontal_push", "band", "",
+              "Step closer to the anchor to lighten the band.", "resistance band chest press"),
+    # Vertical push
+    _exercise("Overhead Press", "shoulders triceps", "vertical_push", "barbell", "shoulder lower_back neck",
+              "Press from a seated position with a lighter load.", "military press, ohp, shoulder press"),
+    _exercise("Seated Dumbbell Shoulder Press", "shoulders triceps", "vertical_push", "dumbbell bench", "shoulder",
+              "Use a neutral grip and stop at forehead height.", "dumbbell shoulder press"),
+    _exercise("Landmine Press", "shoulders chest triceps", "vertical_push", "barbell", "",
+              "The angled path is kinder to the shoulder than a strict overhead press.", ""),
+    _exercise("Pike Push-Up", "shoulders triceps", "vertical_push", "bodyweight", "wrist shoulder neck",
+              "Raise the hands on a box to reduce the load.", "pike push up"),
+    _exercise("Lateral Raise", "shoulders", "isolation", "dumbbell cable band", "shoulder",
+              "Raise only to shoulder height with light weight.", "side raise, lateral raises"),
+    # Horizontal pull
+    _exercise("Bent-Over Barbell Row", "back biceps lower_back", "horizontal_pull", "barbell", "lower_back",
+              "Support the chest on an incline bench instead.", "barbell row, bent over row"),
+    _exercise("Chest-Supported Dumbbell Row", "back biceps", "horizontal_pull", "dumbbell bench", "",
+              "The bench removes the load from the lower back.", "chest supported row, incline row"),
+    _exercise("One-Arm Dumbbell Row", "back biceps", "horizontal_pull", "dumbbell bench", "",
+              "Brace a hand on the bench to support the spine.", "dumbbell row, single arm row"),
+    _exercise("Seated Cable Row", "back biceps", "horizontal_pull", "cable", "",
+              "Keep the torso upright and the weight moderate.", "cable row"),
+    _exercise("Inverted Row", "back biceps core", "horizontal_pull", "bodyweight rack", "",
+              "Walk the feet back to stand more upright.", "bodyweight row, australian pull-up"),
+    _exercise("Band Row", "back biceps", "horizontal_pull", "band", "",
+              "Step closer to the anchor to lighten the band.", "resistance band row"),
+    _exercise("Face Pull", "shoulders back", "horizontal_pull", "cable band", "",
+              "Pull to the chin with light resistance.", "face pulls"),
+    # Vertical pull
+    _exercise("Pull-Up", "back biceps", "vertical_pull", "pull_up_bar", "shoulder elbow",
+              "Use a band or a jump and slow negatives.", "pull up, pullup, chin-up, chin up"),
+    _exercise("Lat Pulldown", "back biceps", "vertical_pull", "cable machine", "",
+              "Use a neutral grip and pull to the upper chest.", "pulldown, lat pull down"),
+    _exercise("Band Pulldown", "back biceps", "vertical_pull", "band", "",
+              "Anchor the band high and kneel to pull.", "resistance band pulldown"),
+    # Arms
+    _exercise("Dumbbell Curl", "biceps", "isolation", "dumbbell", "elbow",
+              "Use a hammer grip and lighter weight.", "bicep curl, biceps curl, curl"),
+    _exercise("Band Curl", "biceps", "isolation", "band", "",
+              "Choose a lighter band and slow the tempo.", "resistance band curl"),
+    _exercise("Triceps Pushdown", "triceps", "isolation", "cable band", "elbow",
+              "Use a rope and keep the elbows pinned.", "tricep pushdown, pushdown"),
+    _exercise("Bench Dip", "triceps chest", "isolation", "bench", "shoulder wrist",
+              "Keep the feet close and dip only a short range.", "tricep dip, triceps dip"),
+    # Core
+    _exercise("Plank", "core", "core", "bodyweight", "",
+              "Drop to the knees or raise the hands on a bench.", "front plank"),
+    _exercise("Side Plank", "core", "core", "bodyweight", "shoulder",
+              "Bend the knees and shorten the hold.", ""),
+    _exercise("Dead Bug", "core", "core", "bodyweight", "",
+              "Move only the legs and keep the lower back down.", "deadbug"),
+    _exercise("Bird Dog", "core lower_back glutes", "core", "bodyweight", "",
+              "Extend one limb at a time.", "birddog"),
+    _exercise("Pallof Press", "core", "core", "cable band", "",
+              "Stand closer to the anchor to reduce the pull.", "anti-rotation press"),
+    _exercise("Crunch", "core", "core", "bodyweight", "neck lower_back",
+              "Keep the range small and the chin tucked.", "crunches, sit-up, sit up"),
+    _exercise("Hanging Leg Raise", "core", "core", "pull_up_bar", "shoulder lower_back",
+              "Raise bent knees instead of straight legs.", "leg raise"),
+    # Carry
+    _exercise("Farmer's Carry", "core grip shoulders", "carry", "dumbbell kettlebell", "",
+              "Walk a shorter distance with lighter weights.", "farmer carry, farmers walk"),
+    _exercise("Suitcase Carry", "core grip", "carry", "dumbbell kettlebell", "",
+              "Carry a lighter weight for shorter distances.", ""),
+    # Calves
+    _exercise("Standing Calf Raise", "calves", "isolation", "bodyweight dumbbell machine", "ankle",
+              "Hold a support and use a partial range.", "calf raise, calf raises"),
+    _exercise("Seated Calf Raise", "calves", "isolation", "machine dumbbell bench", "",
+              "Seated work spares the knees and balance.", ""),
+    # Cardio
+    _exercise("Running", "cardio quads calves", "cardio", "bodyweight", "knee ankle hip",
+              "Swap for brisk walking or reduce the pace.", "run, jogging, jog, treadmill"),
+    _exercise("Stationary Bike", "cardio quads", "cardio", "cardio_machine", "",
+              "Raise the seat to reduce knee bend.", "cycling, bike, exercise bike"),
+    _exercise("Rowing Machine", "cardio back quads", "cardio", "cardio_machine", "lower_back",
+              "Use a short, arms-only stroke at low intensity.", "rower, rowing, erg"),
+    _exercise("Elliptical", "cardio quads glutes", "cardio", "cardio_machine", "",
+              "Reduce resistance and stride length.", "cross trainer"),
+    _exercise("Brisk Walking", "cardio", "cardio", "bodyweight", "",
+              "Walk on flat ground at a comfortable pace.", "walking, walk"),
+    _exercise("Jumping Jacks", "cardio calves shoulders", "cardio", "bodyweight", "knee ankle shoulder",
+              "Step side to side instead of jumping.", "jumping jack"),
+    _exercise("Swimming", "cardio back shoulders", "cardio", "pool", "shoulder",
+              "Use a kickboard to rest the upper body.", "swim"),
+)
+
+# Words in a free-text limitation or injury that map to a contraindication tag
+LIMITATION_KEYWORDS = {
+    "knee": "knee", "acl": "knee", "mcl": "knee", "meniscus": "knee", "patella": "knee", "patellar": "knee",
+    "shoulder": "shoulder", "rotator": "shoulder", "impingement": "shoulder", "labrum": "shoulder",
+    "lumbar": "lower_back", "spine": "lower_back", "spinal": "lower_back",
+    "disc": "lower_back", "sciatica": "lower_back",
+    "wrist": "wrist", "carpal": "wrist",
+    "hip": "hip", "hips": "hip",
+    "elbow": "elbow", "epicondylitis": "elbow",
+    "neck": "neck", "cervical": "neck",
+    "ankle": "ankle", "achilles": "ankle",
+}
+
+# "back" alone is too loose ("coming back after a break"), so only these phrases count
+BACK_LIMITATION = re.compile(
+    r"\b(?:lower|low|bad|sore|injured|hurt|stiff|herniated)\s+back\b"
+    r"|\bback\s+(?:pain|ache|injury|injuries|problem|problems|issue|issues|strain|spasm|spasms|surgery)\b"
+    r"|\bbackache\b"
+)
+
+# Words in a free-text equipment description that map to equipment tags
+EQUIPMENT_KEYWORDS = {
+    "dumbbell": {"dumbbell"}, "dumbbells": {"dumbbell"},
+    "barbell": {"barbell", "rack"}, "barbells": {"barbell", "rack"},
+    "kettlebell": {"kettlebell"}, "kettlebells": {"kettlebell"},
+    "band": {"band"}, "bands": {"band"},
+    "cable": {"cable"}, "cables": {"cable"},
+    "machine": {"machine"}, "machines": {"machine"},
+    "bench": {"bench"}, "rack": {"rack"}, "pool": {"pool"},
+    "bar": {"pull_up_bar"}, "pullup": {"pull_up_bar"},
+    "bike": {"cardio_machine"}, "treadmill": {"cardio_machine"}, "rower": {"cardio_machine"},
+    "gym": {"dumbbell", "barbell", "rack", "kettlebell", "cable", "machine", "bench",
+            "pull_up_bar", "cardio_machine", "band"},
+}
+
+# Every equipment tag, used when a description only says what is missing ("no barbell")
+ALL_EQUIPMENT = set().union(*EQUIPMENT_KEYWORDS.values()) | {"bodyweight"}
+
+# Words that negate the equipment word following them ("no barbell", "without a bench")
+NEGATIONS = {"no", "not", "without", "don", "dont", "lack", "lacking", "never"}
+
+# Extra words that do not change which catalog exercise a name refers to.
+# Equipment and body-position words ("machine", "lying", "incline") are deliberately absent.
+HARMLESS_QUALIFIERS = {
+    "single", "one", "arm", "sided", "alternating", "weighted", "wide", "close", "narrow",
+    "neutral", "grip", "overhand", "underhand", "pronated", "supinated", "pause", "paused",
+    "tempo", "slow", "light", "heavy", "standard", "regular", "strict",
+}
+
+# Day-focus words that expand to several muscle groups
+FOCUS_MUSCLES = {
+    "legs": {"quads", "glutes", "hamstrings", "calves"},
+    "lower": {"quads", "glutes", "hamstrings"},
+    "upper": {"chest", "back", "shoulders"},
+    "push": {"chest", "shoulders", "triceps"},
+    "pull": {"back", "biceps"},
+    "arms": {"biceps", "triceps"},
+    "abs": {"core"},
+    "full": {"quads", "glutes", "chest", "back", "core"},
+    "conditioning": {"cardio"},
+    "endurance": {"cardio"},
+}
+
+
+def _normalize(name: str) -> str:
+    """Lowercase, collapse punctuation and drop plural endings ("squats" -> "squat")"""
+    words = re.sub(r"[^a-z0-9]+", " ", name.lower()).split()
+    return " ".join(re.sub(r"(?<=\w{2})s$", "", word) for word in words)
+
+
+def _words(text: str) -> List[str]:
+    return re.findall(r"[a-z]+", text.lower())
+
+
+def _as_text(value: Any) -> str:
+    """Flatten profile values that arrive as lists (e.g. ["knee", "wrist"]) into text"""
+    if isinstance(value, (list, tuple, set)):
+        return ", ".join(str(item) for item in value)
+    return str(value)
+
+
+def parse_limitations(text: Any) -> Set[str]:
+    """Map a free-text limitation (e.g. "left knee pain") to contraindication tags"""
+    if not text:
+        return set()
+    text = _as_text(text)
+    tags = {LIMITATION_KEYWORDS[word] for word in _words(text) if word in LIMITATION_KEYWORDS}
+    if BACK_LIMITATION.search(text.lower()):
+        tags.add("lower_back")
+    return tags
+
+
+def parse_equipment(text: Any) -> Optional[Set[str]]:
+    """Map a free-text equipment description to equipment tags.
+
+    Returns None when nothing is recognised so callers do not filter by
+    equipment; bodyweight is always considered available otherwise.
+    Negated items ("no barbell") are removed from what is available.
+    """
+    if not text:
+        return None
+    text = _as_text(text)
+    words = _words(text)
+    available: Set[str] = set()
+    missing: Set[str] = set()
+    for position, word in enumerate(words):
+        tags = EQUIPMENT_KEYWORDS.get(word, set())
+        if NEGATIONS & set(words[max(0, position - 2):position]):
+            missing |= tags
+        else:
+            available |= tags
+    if available:
+        return (available | {"bodyweight"}) - missing
+    if re.search(r"\b(none|no equipment|bodyweight|home)\b", text.lower()):
+        return {"bodyweight"}
+    if missing:
+        return ALL_EQUIPMENT - missing
+    return None
+
+
+class ExerciseIndex:
+    """In-memory catalog indexed by muscle group, movement pattern, equipment and contraindication"""
+
+    def __init__(self, exercises: Iterable[Exercise] = CATALOG):
+        self.exercises: Dict[str, Exercise] = {}
+        self._names: Dict[str, str] = {}
+        self.by_muscle: Dict[str, Set[str]] = {}
+        self.by_pattern: Dict[str, Set[str]] = {}
+        self.by_equipment: Dict[str, Set[str]] = {}
+        self.by_contraindication: Dict[str, Set[str]] = {}
+
+        for exercise in exercises:
+            self.exercises[exercise.name] = exercise
+            for alias in {exercise.name, *exercise.aliases}:
+                self._names[_normalize(alias)] = exercise.name
+            for muscle in exercise.muscle_groups:
+                self.by_muscle.setdefault(muscle, set()).add(exercise.name)
+            self.by_pattern.setdefault(exercise.movement_pattern, set()).add(exercise.name)
+            for item in exercise.equipment:
+                self.by_equipment.setdefault(item, set()).add(exercise.name)
+            for area in exercise.contraindications:
+                self.by_contraindication.setdefault(area, set()).add(exercise.name)
+
+        # Longest names first so "romanian deadlift" wins over "deadlift"
+        self._names_by_length = sorted(self._names, key=len, reverse=True)
+
+    def find(self, name: str) -> Optional[Exercise]:
+        """Look up an exercise by name or alias.
+
+        Extra words are tolerated only around multi-word names and only when
+        they are harmless qualifiers ("single arm", "close grip"), so "pistol
+        squat", "lying leg raise" or "machine shoulder press" return None
+        rather than a different exercise.
+        """
+        normalized = _normalize(name)
+        if normalized in self._names:
+            return self.exercises[self._names[normalized]]
+        padded = f" {normalized} "
+        for alias in self._names_by_length:
+            if " " not in alias or f" {alias} " not in padded:
+                continue
+            extra = set(padded.replace(f" {alias} ", " ", 1).split())
+            if extra <= HARMLESS_QUALIFIERS:
+                return self.exercises[self._names[alias]]
+        return None
+
+    def is_safe(self, exercise: Exercise, contraindications: Set[str]) -> bool:
+        return not (exercise.contraindications & contraindications)
+
+    def is_available(self, exercise: Exercise, equipment: Optional[Set[str]]) -> bool:
+        """Equipment tags on an exercise are alternatives; any one of them suffices"""
+        return equipment is None or bool(exercise.equipment & equipment)
+
+    def alternatives(self, exercise: Exercise, limitation: Optional[str] = None,
+                     equipment: Optional[Set[str]] = None, limit: int = 3) -> List[Exercise]:
+        """Safe exercises training the same muscles, best movement-pattern matches first"""
+        avoid = parse_limitations(limitation)
+        candidates = set(self.by_pattern.get(exercise.movement_pattern, set()))
+        for muscle in exercise.muscle_groups:
+            candidates |= self.by_muscle.get(muscle, set())
+        for area in avoid:
+            candidates -= self.by_contraindication.get(area, set())
+        candidates.discard(exercise.name)
+
+        scored = []
+        for name in candidates:
+            candidate = self.exercises[name]
+            if not self.is_available(candidate, equipment):
+                continue
+            overlap = len(candidate.muscle_groups & exercise.muscle_groups)
+            score = overlap + (2 if candidate.movement_pattern == exercise.movement_pattern else 0)
+            if overlap:
+                scored.append((-score, name, candidate))
+        return [candidate for _, _, candidate in sorted(scored)[:limit]]
+
+    def equipment_substitutes(self, exercise: Exercise, equipment: Optional[Set[str]] = None,
+                              limitation: Optional[str] = None, limit: int = 3) -> List[Exercise]:
+        """Safe same-pattern exercises using different equipment"""
+        avoid = parse_limitations(limitation)
+        substitutes = []
+        for name in sorted(self.by_pattern.get(exercise.movement_pattern, set())):
+            candidate = self.exercises[name]
+            if name == exercise.name or candidate.equipment == exercise.equipment:
+                continue
+            if not (candidate.muscle_groups & exercise.muscle_groups):
+                continue
+            if self.is_safe(candidate, avoid) and self.is_available(candidate, equipment):
+                substitutes.append(candidate)
+        return substitutes[:limit]
+
+    def for_focus(self, focus: str, injuries: Optional[str] = None,
+                  equipment: Optional[Set[str]] = None, limit: int = 4) -> List[Exercise]:
+        """Safe, available exercises for a day focus, one per movement pattern"""
+        words = set(_words(focus))
+        focus_muscles = set()
+        for word in words:
+            focus_muscles |= FOCUS_MUSCLES.get(word, {word})
+        avoid = parse_limitations(injuries)
+
+        names = set()
+        for muscle in focus_muscles:
+            names |= self.by_muscle.get(muscle, set())
+
+        ranked = []
+        for name in names:
+            candidate = self.exercises[name]
+            if candidate.movement_pattern in ("cardio", "core") and candidate.movement_pattern not in focus_muscles:
+                continue
+            if self.is_safe(candidate, avoid) and self.is_available(candidate, equipment):
+                ranked.append((-len(candidate.muscle_groups & focus_muscles), name, candidate))
+
+        picked: List[Exercise] = []
+        patterns_used: Set[str] = set()
+        for _, _, candidate in sorted(ranked):
+            if candidate.movement_pattern in patterns_used:
+                continue
+            picked.append(candidate)
+            patterns_used.add(candidate.movement_pattern)
+            if len(picked) >= limit:
+                break
+        return picked
+
+    def review_plan(self, plan: Dict[str, Any], injuries: Optional[str] = None,
+                    equipment: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
+        """Swap contraindicated exercises and fill empty days in a generated workout plan.
+
+        Walks `weekly_schedule` entries of the form {"focus": ..., "exercises": [...]}
+        where exercises are names or dicts with a "name"/"exercise" key, edits the
+        plan in place and returns the changes made. Conflicting exercises with no
+        safe replacement are kept and reported as "flagged".
+        """
+        avoid = parse_limitations(injuries)
+        changes: List[Dict[str, Any]] = []
+
+        for day in plan.get("weekly_schedule") or []:
+            if not isinstance(day, dict):
+                continue
+            exercises = day.get("exercises")
+            if not exercises and day.get("focus"):
+                filled = self.for_focus(str(day["focus"]), injuries, equipment)
+                if filled:
+                    day["exercises"] = [exercise.name for exercise in filled]
+                    changes.append({"action": "filled", "focus": day["focus"],
+                                    "exercises": day["exercises"]})
+                continue
+
+            for position, item in enumerate(exercises or []):
+                key = None
+                if isinstance(item, dict):
+                    key = "name" if "name" in item else "exercise" if "exercise" in item else None
+                    name = item.get(key) if key else None
+                else:
+                    name = item
+                exercise = self.find(str(name)) if name else None
+                if exercise is None:
+                    continue
+                if self.is_safe(exercise, avoid) and self.is_available(exercise, equipment):
+                    continue
+                replacements = self.alternatives(exercise, injuries, equipment, limit=1)
+                if not replacements:
+                    changes.append({
+                        "action": "flagged",
+                        "exercise": name,
+                        "conflicts": sorted(exercise.contraindications & avoid),
+                        "equipment_unavailable": not self.is_available(exercise, equipment),
+                    })
+                    continue
+                replacement = replacements[0].name
+                if key:
+                    item[key] = replacement
+                else:
+                    exercises[position] = replacement
+                changes.append({"action": "substituted", "original": name, "replacement": replacement})
+
+        return changes
+
+
+# Global exercise index instance
+exercise_index = ExerciseIndex()
@@ -0,0 +1,308 @@
+"""
+Background job queue for long-running AI plan generation
+"""
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import logging
+import threading
+import time
+import uuid
+
+from ..agents.errors import AgentNotConfiguredError, CircuitOpenError, ModelRequestError, ModelTimeoutError
+from ..agents.resilience import deadline, remaining_time
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Failures that retrying within the same job cannot fix
+NON_RETRYABLE_ERRORS = (AgentNotConfiguredError, CircuitOpenError, ModelRequestError)
+
+
+class JobStatus(str, Enum):
+    """Lifecycle states of a background job"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+@dataclass
+class Job:
+    """A unit of work submitted to the job queue"""
+    job_id: str
+    kind: str
+    func: Callable[..., Awaitable[Any]]
+    args: tuple = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    status: JobStatus = JobStatus.QUEUED
+    attempts: int = 0
+    result: Any = None
+    error: Optional[str] = None
+    error_type: Optional[str] = None
+    timeout: Optional[float] = None
+    deadline_at: Optional[float] = None  # time.monotonic() by which the job must finish
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    expires_at: Optional[float] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the job for API responses"""
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "status": self.status.value,
+            "attempts": self.attempts,
+            "result": self.result,
+            "error": self.error,
+            "error_type": self.error_type,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity"""
+    pass
+
+
+class JobQueue:
+    """Bounded async worker pool with retries and an expiring result store.
+
+    The pool runs its own event loop on a daemon thread so that synchronous
+    request handlers can submit coroutines and return immediately with a job id.
+    Jobs and results are held in this process only; they are not visible to
+    other server processes.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_queue_size: Optional[int] = None,
+                 max_retries: Optional[int] = None, retry_backoff: Optional[float] = None,
+                 result_ttl: Optional[float] = None):
+        self.workers = workers or settings.job_workers
+        self.max_queue_size = max_queue_size or settings.job_max_queue_size
+        self.max_retries = settings.job_max_retries if max_retries is None else max_retries
+        self.retry_backoff = settings.job_retry_backoff_seconds if retry_backoff is None else retry_backoff
+        self.result_ttl = result_ttl or settings.job_result_ttl_seconds
+
+        self._jobs: Dict[str, Job] = {}
+        self._subscribers: Dict[str, List[Callable[[Job], None]]] = {}
+        self._events: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._latencies: List[float] = []
+        self._completed = 0
+        self._failed = 0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+
+    def start(self):
+        """Start the worker pool on a background event loop"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._started.clear()
+        self._thread = threading.Thread(target=self._run_loop, name="job-queue", daemon=True)
+        self._thread.start()
+        self._started.wait()
+        logger.info(f"Job queue started with {self.workers} workers")
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the worker pool; jobs that have not finished are marked failed"""
+        if not self._loop:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread:
+            self._thread.join(timeout)
+        self._loop = None
+        self._queue = None
+        self._thread = None
+
+        with self._lock:
+            unfinished = [job for job in self._jobs.values() if not job.done]
+        for job in unfinished:
+            job.error = "Job queue stopped before the job finished"
+            job.error_type = "JobCancelled"
+            job.status = JobStatus.FAILED
+            self._finish(job)
+        logger.info("Job queue stopped")
+
+    def _run_loop(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        for _ in range(self.workers):
+            self._loop.create_task(self._worker())
+        self._started.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            for task in asyncio.all_tasks(self._loop):
+                task.cancel()
+            self._loop.run_until_complete(asyncio.sleep(0))
+            self._loop.close()
+
+    def submit(self, kind: str, func: Callable[..., Awaitable[Any]], *args,
+               timeout: Optional[float] = None, **kwargs) -> str:
+        """Submit a coroutine function for background execution and return its job id.
+
+        `timeout` bounds the job from submission, including time spent queued
+        and retries, and defaults to the configured job timeout.
+        """
+        self.start()
+        self._purge_expired()
+
+        timeout = timeout or settings.job_timeout_seconds
+        job = Job(job_id=uuid.uuid4().hex, kind=kind, func=func, args=args, kwargs=kwargs,
+                  timeout=timeout, deadline_at=time.monotonic() + timeout)
+        with self._lock:
+            pending = sum(1 for queued in self._jobs.values() if queued.status == JobStatus.QUEUED)
+            if pending >= self.max_queue_size:
+                raise QueueFullError(f"Job queue is full ({self.max_queue_size} jobs pending)")
+            self._jobs[job.job_id] = job
+            self._events[job.job_id] = threading.Event()
+
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, job)
+        logger.info(f"Job {job.job_id} ({kind}) queued")
+        return job.job_id
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return a job by id, or None if unknown or expired"""
+        self._purge_expired()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[Job]:
+        """Block until the job finishes or the timeout elapses"""
+        with self._lock:
+            event = self._events.get(job_id)
+        if event is None:
+            return None
+        event.wait(timeout)
+        return self.get(job_id)
+
+    def subscribe(self, job_id: str, callback: Callable[[Job], None]) -> bool:
+        """Register a callback invoked once the job finishes.
+
+        The callback runs immediately if the job is already done. Returns False
+        for unknown job ids.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return False
+            if not job.done:
+                self._subscribers.setdefault(job_id, []).append(callback)
+                return True
+        callback(job)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, in-flight counts and job latency figures"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            running = sum(1 for job in self._jobs.values() if job.status == JobStatus.RUNNING)
+            queued = sum(1 for job in self._jobs.values() if job.status == JobStatus.QUEUED)
+            stats = {
+                "workers": self.workers,
+                "queue_depth": queued,
+                "max_queue_size": self.max_queue_size,
+                "running": running,
+                "completed": self._completed,
+                "failed": self._failed,
+                "stored_results": len(self._jobs),
+            }
+        if latencies:
+            stats["latency_avg_seconds"] = round(sum(latencies) / len(latencies), 3)
+            stats["latency_p95_seconds"] = round(latencies[int(0.95 * (len(latencies) - 1))], 3)
+        return stats
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._execute(job)
+            finally:
+                self._queue.task_done()
+
+    async def _execute(self, job: Job):
+        job.status = JobStatus.RUNNING
+        job.started_at = time.time()
+
+        remaining = job.deadline_at - time.monotonic()
+        if remaining <= 0:
+            job.error = f"Job deadline of {job.timeout:.1f}s passed while queued"
+            job.error_type = ModelTimeoutError.__name__
+            job.status = JobStatus.FAILED
+            self._finish(job)
+            return
+
+        # Model calls inside the job inherit its deadline, so retries never outlive it
+        with deadline(remaining):
+            while True:
+                job.attempts += 1
+                try:
+                    job.result = await asyncio.wait_for(job.func(*job.args, **job.kwargs), remaining_time())
+                    job.status = JobStatus.SUCCEEDED
+                    break
+                except asyncio.TimeoutError:
+                    e = ModelTimeoutError(f"Job exceeded its {job.timeout:.1f}s deadline")
+                except Exception as exc:
+                    e = exc
+
+                logger.error(f"Job {job.job_id} attempt {job.attempts} failed: {str(e)}")
+                backoff = self.retry_backoff * (2 ** (job.attempts - 1))
+                remaining = remaining_time()
+                if (job.attempts > self.max_retries or isinstance(e, NON_RETRYABLE_ERRORS)
+                        or (remaining is not None and remaining <= backoff)):
+                    job.error = str(e)
+                    job.error_type = type(e).__name__
+                    job.status = JobStatus.FAILED
+                    break
+                await asyncio.sleep(backoff)
+
+        self._finish(job)
+
+    def _finish(self, job: Job):
+        job.finished_at = time.time()
+        job.expires_at = job.finished_at + self.result_ttl
+
+        with self._lock:
+            self._latencies.append(job.finished_at - job.submitted_at)
+            self._latencies = self._latencies[-1000:]
+            if job.status == JobStatus.SUCCEEDED:
+                self._completed += 1
+            else:
+                self._failed += 1
+            callbacks = self._subscribers.pop(job.job_id, [])
+            event = self._events.get(job.job_id)
+
+        for callback in callbacks:
+            try:
+                callback(job)
+            except Exception as e:
+                logger.error(f"Job {job.job_id} subscriber error: {str(e)}")
+        if event:
+            event.set()
+
+        logger.info(f"Job {job.job_id} ({job.kind}) {job.status.value} after {job.attempts} attempt(s)")
+
+    def _purge_expired(self):
+        now = time.time()
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if job.expires_at is not None and job.expires_at <= now]
+            for job_id in expired:
+                self._jobs.pop(job_id, None)
+                self._events.pop(job_id, None)
+
+
+# Global job queue instance
+job_queue = JobQueue()
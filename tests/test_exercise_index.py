@@ -0,0 +1,166 @@
+"""
+Tests for the local exercise substitution index
+"""
+import asyncio
+from types import SimpleNamespace
+
+from src.agents import PTCoachAgent
+from src.core.config import settings
+from src.services.exercise_index import exercise_index, parse_equipment, parse_limitations
+
+
+def test_find_tolerates_aliases_and_plurals():
+    """Test that exercises are found by alias and plural names."""
+    assert exercise_index.find("barbell back squats").name == "Barbell Back Squat"
+    assert exercise_index.find("RDLs").name == "Romanian Deadlift"
+    assert exercise_index.find("push-ups").name == "Push-Up"
+    assert exercise_index.find("underwater basket weaving") is None
+
+
+def test_find_does_not_swap_in_a_different_exercise():
+    """Test that variants outside the catalog are not matched to a generic entry."""
+    for name in ("Front Squat", "Pistol Squat", "Jump squat", "Hack squat", "Wrist curl", "Ring dips",
+                 "Lying Leg Raise", "Machine Shoulder Press", "Incline Dumbbell Curl"):
+        assert exercise_index.find(name) is None, name
+    assert exercise_index.find("single-arm dumbbell curl").name == "Dumbbell Curl"
+    assert exercise_index.find("close grip bench press").name == "Barbell Bench Press"
+
+
+def test_alternatives_respect_limitation_and_equipment():
+    """Test that alternatives avoid the limited area and use available equipment."""
+    squat = exercise_index.find("back squat")
+    equipment = parse_equipment("dumbbells and a bench")
+    alternatives = exercise_index.alternatives(squat, "left knee pain", equipment)
+
+    assert alternatives
+    for alternative in alternatives:
+        assert "knee" not in alternative.contraindications
+        assert alternative.equipment & equipment
+        assert alternative.muscle_groups & squat.muscle_groups
+
+
+def test_parsers_map_free_text_to_tags():
+    """Test limitation and equipment parsing."""
+    assert parse_limitations("lower back disc issue and a bad shoulder") == {"lower_back", "shoulder"}
+    assert parse_limitations("back pain when bending") == {"lower_back"}
+    assert parse_limitations("coming back after a long break") == set()
+    assert parse_limitations("plantar fasciitis in my foot") == set()
+    assert parse_equipment("no equipment, home workouts") == {"bodyweight"}
+    assert parse_equipment("whatever is around") is None
+    assert parse_equipment("only dumbbells") == {"dumbbell", "bodyweight"}
+    assert "barbell" not in parse_equipment("no barbell")
+    assert parse_equipment("no barbell at home") == {"bodyweight"}
+
+
+def test_parsers_accept_lists_from_json_profiles():
+    """Test that list-valued profile fields are parsed rather than raising."""
+    assert parse_limitations(["knee", "wrist"]) == {"knee", "wrist"}
+    assert parse_equipment(["dumbbells", "bench"]) == {"dumbbell", "bench", "bodyweight"}
+
+    plan = {"weekly_schedule": [{"focus": "legs", "exercises": ["Barbell Back Squat"]}]}
+    changes = exercise_index.review_plan(plan, injuries=["knee"], equipment=parse_equipment(["dumbbells"]))
+    assert changes and changes[0]["action"] == "substituted"
+
+
+def test_review_plan_substitutes_and_fills():
+    """Test that contraindicated exercises are swapped and empty days filled."""
+    plan = {
+        "weekly_schedule": [
+            {"day": "Monday", "focus": "upper body", "exercises": [{"name": "Overhead Press", "sets": 3}]},
+            {"day": "Wednesday", "focus": "legs", "exercises": []},
+        ]
+    }
+    changes = exercise_index.review_plan(plan, injuries="shoulder impingement", equipment=parse_equipment("gym"))
+
+    monday, wednesday = plan["weekly_schedule"]
+    assert exercise_index.find(monday["exercises"][0]["name"]).contraindications.isdisjoint({"shoulder"})
+    assert monday["exercises"][0]["sets"] == 3
+    assert wednesday["exercises"]
+    assert [change["action"] for change in changes] == ["substituted", "filled"]
+
+
+def test_review_plan_flags_conflicts_without_replacement():
+    """Test that a conflicting exercise with no safe replacement is kept and flagged."""
+    plan = {"weekly_schedule": [{"focus": "shoulders", "exercises": ["Overhead Press"]}]}
+    changes = exercise_index.review_plan(plan, injuries="shoulder impingement",
+                                         equipment=parse_equipment("no equipment"))
+
+    assert plan["weekly_schedule"][0]["exercises"] == ["Overhead Press"]
+    assert changes == [{
+        "action": "flagged",
+        "exercise": "Overhead Press",
+        "conflicts": ["shoulder"],
+        "equipment_unavailable": True,
+    }]
+
+
+def test_suggest_exercise_modifications_without_model():
+    """Test that catalog exercises are answered without calling the model."""
+    agent = PTCoachAgent()
+    agent.client = None
+    answer = asyncio.run(agent.suggest_exercise_modifications("Barbell Deadlift", "lower back pain"))
+
+    assert answer.startswith("Modifications for Barbell Deadlift")
+    assert "Alternative exercises:" in answer
+
+
+def test_unrecognised_limitation_asks_the_model():
+    """Test that limitations the catalog cannot interpret go to the model."""
+    agent = PTCoachAgent()
+    prompts = []
+
+    async def fake_response(prompt, include_context=True, timeout=None):
+        prompts.append(prompt)
+        return "model answer"
+
+    agent.get_response = fake_response
+    answer = asyncio.run(agent.suggest_exercise_modifications("Running", "plantar fasciitis in my foot"))
+
+    assert answer == "model answer"
+    assert "plantar fasciitis" in prompts[0]
+
+
+def test_knee_limitation_keeps_equipment_alternatives_safe():
+    """Test that equipment alternatives exclude exercises contraindicated for the limitation."""
+    suggestion = PTCoachAgent().get_exercise_alternatives("Barbell Back Squat", "knee pain")
+
+    assert suggestion["contraindicated"]
+    for section in ("alternatives", "equipment_alternatives"):
+        for entry in suggestion[section]:
+            assert "knee" not in exercise_index.find(entry["name"]).contraindications, entry["name"]
+
+
+def test_equipment_limitation_is_answered_locally():
+    """Test that equipment-only limitations are answered from the catalog."""
+    agent = PTCoachAgent()
+    agent.client = None
+    answer = asyncio.run(agent.suggest_exercise_modifications("Barbell Back Squat", "only dumbbells at home"))
+
+    assert answer.startswith("Modifications for Barbell Back Squat")
+    assert "equipment you don't have" in answer
+    assert "Goblet Squat" in answer
+
+
+def test_workout_plan_adjustments_do_not_touch_cached_answer(monkeypatch):
+    """Test that catalog adjustments are not applied twice to a cached fallback answer."""
+    monkeypatch.setattr(settings, 'model_fallback', "cache")
+    content = '{"workout_plan": {"weekly_schedule": [{"focus": "legs", "exercises": []}]}}'
+    completions = SimpleNamespace(error=None)
+
+    async def create(**kwargs):
+        if completions.error:
+            raise completions.error
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    completions.create = create
+    agent = PTCoachAgent()
+    agent.model_name = 'workout-cache-deployment'
+    agent.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    profile = {"equipment": "basic gym equipment"}
+
+    fresh = asyncio.run(agent.create_workout_plan(profile))
+    completions.error = RuntimeError("service unavailable")
+    cached = asyncio.run(agent.create_workout_plan(profile))
+
+    assert cached["degraded"] is True
+    assert cached["workout_plan"]["exercise_adjustments"] == fresh["workout_plan"]["exercise_adjustments"]
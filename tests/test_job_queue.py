@@ -0,0 +1,156 @@
+"""
+Tests for the background job queue
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.agents.errors import ModelRequestError
+from src.services.job_queue import JobQueue, JobStatus, QueueFullError
+
+
+@pytest.fixture
+def queue():
+    """Create a small job queue and stop it after the test."""
+    job_queue = JobQueue(workers=2, max_queue_size=10, max_retries=1, retry_backoff=0, result_ttl=60)
+    yield job_queue
+    job_queue.stop()
+
+
+def test_job_succeeds(queue):
+    """Test that a submitted job runs and stores its result."""
+    async def work(value):
+        return {"value": value}
+
+    job_id = queue.submit('test', work, 42)
+    job = queue.wait(job_id, timeout=5)
+    assert job.status == JobStatus.SUCCEEDED
+    assert job.result == {"value": 42}
+    assert queue.stats()['completed'] == 1
+
+
+def test_job_retries_then_fails(queue):
+    """Test that a failing job is retried before being marked failed."""
+    async def broken():
+        raise RuntimeError("model unavailable")
+
+    job_id = queue.submit('test', broken)
+    job = queue.wait(job_id, timeout=5)
+    assert job.status == JobStatus.FAILED
+    assert job.attempts == 2
+    assert job.error == "model unavailable"
+
+
+def test_rejected_request_is_not_retried(queue):
+    """Test that provider rejections fail the job on the first attempt."""
+    async def rejected():
+        raise ModelRequestError("bad request", status_code=400)
+
+    job = queue.wait(queue.submit('test', rejected), timeout=5)
+    assert job.status == JobStatus.FAILED
+    assert job.attempts == 1
+    assert job.error_type == 'ModelRequestError'
+
+
+def test_job_deadline_bounds_retries(queue):
+    """Test that a job stops retrying once its deadline has passed."""
+    async def slow():
+        await asyncio.sleep(1)
+
+    job_id = queue.submit('test', slow, timeout=0.05)
+    job = queue.wait(job_id, timeout=5)
+    assert job.status == JobStatus.FAILED
+    assert job.error_type == 'ModelTimeoutError'
+    assert job.attempts == 1
+
+
+def test_subscribe_notifies_on_completion(queue):
+    """Test that subscribers are called with the finished job."""
+    finished = []
+
+    async def work():
+        return "done"
+
+    job_id = queue.submit('test', work)
+    assert queue.subscribe(job_id, finished.append)
+    queue.wait(job_id, timeout=5)
+    assert finished and finished[0].result == "done"
+    assert not queue.subscribe('unknown', finished.append)
+
+
+def test_queue_full_rejects_submission():
+    """Test that submissions beyond the queue bound are rejected."""
+    job_queue = JobQueue(workers=1, max_queue_size=1, max_retries=0, retry_backoff=0, result_ttl=60)
+    release = threading.Event()
+
+    async def blocker():
+        while not release.is_set():
+            await asyncio.sleep(0.01)
+
+    try:
+        running_id = job_queue.submit('test', blocker)
+        give_up = time.monotonic() + 5
+        while job_queue.get(running_id).status != JobStatus.RUNNING:
+            assert time.monotonic() < give_up, "job never started"
+            time.sleep(0.01)
+        job_queue.submit('test', blocker)
+        with pytest.raises(QueueFullError):
+            job_queue.submit('test', blocker)
+        assert job_queue.stats()['queue_depth'] == 1
+    finally:
+        release.set()
+        job_queue.stop()
+
+
+def test_stop_fails_unfinished_jobs():
+    """Test that stopping the queue fails pending jobs so they expire and free capacity."""
+    job_queue = JobQueue(workers=1, max_queue_size=1, max_retries=0, retry_backoff=0, result_ttl=60)
+
+    async def slow():
+        await asyncio.sleep(10)
+
+    running_id = job_queue.submit('test', slow)
+    give_up = time.monotonic() + 5
+    while job_queue.get(running_id).status != JobStatus.RUNNING:
+        assert time.monotonic() < give_up, "job never started"
+        time.sleep(0.01)
+    queued_id = job_queue.submit('test', slow)
+    job_queue.stop()
+
+    for job_id in (running_id, queued_id):
+        job = job_queue.get(job_id)
+        assert job.status == JobStatus.FAILED
+        assert job.expires_at is not None
+    assert job_queue.stats()['queue_depth'] == 0
+    job_queue.submit('test', slow)
+    job_queue.stop()
+
+
+def test_deadline_counts_time_spent_queued():
+    """Test that a job whose deadline passes while queued fails without running."""
+    job_queue = JobQueue(workers=1, max_queue_size=5, max_retries=0, retry_backoff=0, result_ttl=60)
+    release = threading.Event()
+    ran = []
+
+    async def blocker():
+        while not release.is_set():
+            await asyncio.sleep(0.01)
+
+    async def work():
+        ran.append(True)
+
+    try:
+        job_queue.submit('test', blocker)
+        job_id = job_queue.submit('test', work, timeout=0.05)
+        time.sleep(0.1)
+        release.set()
+        job = job_queue.wait(job_id, timeout=5)
+        assert job.status == JobStatus.FAILED
+        assert job.error_type == 'ModelTimeoutError'
+        assert job.attempts == 0
+        assert not ran
+    finally:
+        release.set()
+        job_queue.stop()
@@ -0,0 +1,84 @@
+"""
+Tests for the asynchronous plan generation endpoints
+"""
+import time
+
+import pytest
+
+from src.routes import jobs as jobs_routes
+from src.services.job_queue import JobQueue, QueueFullError
+
+
+@pytest.fixture
+def job_queue(monkeypatch):
+    """Route requests to a short-lived job queue."""
+    queue = JobQueue(workers=1, max_queue_size=5, max_retries=0, retry_backoff=0, result_ttl=0.2)
+    monkeypatch.setattr(jobs_routes, 'job_queue', queue)
+    yield queue
+    queue.stop()
+
+
+def test_submit_returns_status_url(client, job_queue):
+    """Test that submitting a plan returns 202 with a pollable status URL."""
+    response = client.post('/jobs/workout-plan', json={"user_profile": {"fitness_level": "beginner"}})
+    assert response.status_code == 202
+    data = response.get_json()
+    assert data['status'] == "queued"
+    assert data['status_url'] == f"/jobs/{data['job_id']}"
+
+    poll = client.get(f"{data['status_url']}?wait=5")
+    assert poll.status_code == 200
+    assert poll.get_json()['job_id'] == data['job_id']
+
+
+def test_unknown_job_returns_404(client, job_queue):
+    """Test that unknown job ids return 404."""
+    response = client.get('/jobs/does-not-exist')
+    assert response.status_code == 404
+
+
+def test_expired_job_returns_404(client, job_queue):
+    """Test that results are no longer served once they expire."""
+    async def work():
+        return {"ok": True}
+
+    job_id = job_queue.submit('test', work)
+    assert job_queue.wait(job_id, timeout=5).done
+    time.sleep(0.3)
+    response = client.get(f'/jobs/{job_id}')
+    assert response.status_code == 404
+
+
+def test_full_queue_returns_503(client, job_queue, monkeypatch):
+    """Test that a full queue rejects submissions with 503."""
+    def reject(*args, **kwargs):
+        raise QueueFullError("Job queue is full (5 jobs pending)")
+
+    monkeypatch.setattr(job_queue, 'submit', reject)
+    response = client.post('/jobs/meal-plan', json={"user_profile": {}})
+    assert response.status_code == 503
+    assert "full" in response.get_json()['error']
+
+
+def test_grocery_list_validates_input(client, job_queue):
+    """Test that grocery list submissions reject missing or malformed fields."""
+    response = client.post('/jobs/grocery-list', json={})
+    assert response.status_code == 400
+
+    response = client.post('/jobs/grocery-list', json={"meal_plan": {}, "household_size": "two"})
+    assert response.status_code == 400
+    assert "household_size" in response.get_json()['error']
+
+
+def test_timeout_header_is_capped(client, job_queue, monkeypatch):
+    """Test that X-Request-Timeout is clamped to the allowed job deadline range."""
+    monkeypatch.setattr(jobs_routes.settings, 'job_timeout_seconds', 10.0)
+
+    response = client.post('/jobs/workout-plan', json={}, headers={'X-Request-Timeout': '3600'})
+    assert job_queue.get(response.get_json()['job_id']).timeout == 10.0
+
+    response = client.post('/jobs/workout-plan', json={}, headers={'X-Request-Timeout': '7.5'})
+    assert job_queue.get(response.get_json()['job_id']).timeout == 7.5
+
+    response = client.post('/jobs/workout-plan', json={}, headers={'X-Request-Timeout': '0.01'})
+    assert job_queue.get(response.get_json()['job_id']).timeout == jobs_routes.MIN_TIMEOUT_SECONDS
@@ -0,0 +1,203 @@
+"""
+Tests for model call deadlines, circuit breakers and degraded-mode fallbacks
+"""
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.agents import PTCoachAgent
+import httpx
+from openai import APIStatusError
+
+from src.agents.errors import CircuitOpenError, ModelCallError, ModelRequestError, ModelTimeoutError
+from src.agents.resilience import (
+    CircuitBreaker,
+    ResponseCache,
+    call_timeout,
+    deadline,
+    get_circuit_breaker,
+)
+from src.core.config import settings
+
+
+class FakeCompletions:
+    """Stand-in for the Azure OpenAI chat completions API."""
+
+    def __init__(self, content="ok", delay=0.0, error=None):
+        self.content = content
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=self.content))])
+
+
+def make_agent(model_name, completions):
+    """Create a PT coach wired to a fake completions API."""
+    agent = PTCoachAgent()
+    agent.model_name = model_name
+    agent.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return agent
+
+
+@pytest.fixture
+def fallback(monkeypatch):
+    """Configure degraded-mode fallbacks for a test."""
+    def configure(modes):
+        monkeypatch.setattr(settings, 'model_fallback', modes)
+    configure("")
+    return configure
+
+
+def test_circuit_breaker_opens_and_recovers():
+    """Test that the breaker opens after repeated failures and half-opens after recovery."""
+    breaker = CircuitBreaker('test', failure_threshold=2, recovery_timeout=0.05)
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    asyncio.run(asyncio.sleep(0.06))
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_deadline_caps_call_timeout():
+    """Test that nested deadlines only tighten the per-call timeout."""
+    with deadline(0.5):
+        assert call_timeout(30.0) <= 0.5
+        with deadline(10.0):
+            assert call_timeout(30.0) <= 0.5
+    assert call_timeout(30.0) == 30.0
+
+
+def test_slow_model_raises_timeout(fallback):
+    """Test that a slow deployment raises a typed timeout error."""
+    agent = make_agent('slow-deployment', FakeCompletions(delay=1.0))
+
+    async def run():
+        with deadline(0.05):
+            return await agent.get_response("Plan my week")
+
+    with pytest.raises(ModelTimeoutError):
+        asyncio.run(run())
+
+
+def test_structured_response_falls_back_to_cache(fallback):
+    """Test that a cached answer is served when the deployment fails."""
+    completions = FakeCompletions(content='{"progression_plan": {"week_1": "light"}}')
+    agent = make_agent('flaky-deployment', completions)
+    first = asyncio.run(agent.create_progression_plan({}))
+    assert first == {"progression_plan": {"week_1": "light"}}
+
+    fallback("cache,template")
+    completions.error = RuntimeError("service unavailable")
+    degraded = asyncio.run(agent.create_progression_plan({}))
+    assert degraded["progression_plan"] == {"week_1": "light"}
+    assert degraded["degraded"] is True
+
+
+def test_open_circuit_serves_template(fallback):
+    """Test that an open circuit fails fast and serves the template answer."""
+    fallback("template")
+    completions = FakeCompletions(error=RuntimeError("service unavailable"))
+    agent = make_agent('down-deployment', completions)
+
+    for _ in range(settings.circuit_breaker_failure_threshold + 2):
+        answer = asyncio.run(agent.get_response("How should I warm up?"))
+
+    assert answer == agent.get_fallback_message()
+    assert completions.calls == settings.circuit_breaker_failure_threshold
+
+
+def test_cancelled_trial_call_releases_breaker(fallback):
+    """Test that cancelling the half-open trial call does not wedge the breaker open."""
+    completions = FakeCompletions(delay=1.0)
+    agent = make_agent('cancelled-deployment', completions)
+    breaker = get_circuit_breaker('cancelled-deployment')
+    breaker.recovery_timeout = 0.05
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    async def cancel_trial():
+        task = asyncio.ensure_future(agent.get_response("Plan my week"))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_trial())
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    completions.delay = 0
+    assert asyncio.run(agent.get_response("Plan my week")) == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_response_cache_returns_copies():
+    """Test that editing a cached or returned answer does not change the cache."""
+    cache = ResponseCache(max_size=2)
+    plan = {"workout_plan": {"weekly_schedule": ["Squat"]}}
+    cache.put('plan', plan)
+    plan["workout_plan"]["weekly_schedule"].append("Deadlift")
+    cache.get('plan')["workout_plan"]["extra"] = True
+
+    assert cache.get('plan') == {"workout_plan": {"weekly_schedule": ["Squat"]}}
+
+
+def test_failed_calls_stay_out_of_history(fallback):
+    """Test that template answers and failed calls leave no turns in history."""
+    agent = make_agent('history-deployment', FakeCompletions(error=RuntimeError("service unavailable")))
+
+    with pytest.raises(ModelCallError):
+        asyncio.run(agent.get_response("How should I warm up?"))
+    assert agent.conversation_history == []
+
+    fallback("template")
+    assert asyncio.run(agent.get_response("How should I warm up?")) == agent.get_fallback_message()
+    assert agent.conversation_history == []
+
+
+def test_short_caller_deadline_does_not_open_breaker(fallback):
+    """Test that timeouts forced by a caller's short deadline do not count against the deployment."""
+    agent = make_agent('deadline-deployment', FakeCompletions(delay=0.2))
+    breaker = get_circuit_breaker('deadline-deployment')
+
+    async def run():
+        with deadline(0.01):
+            return await agent.get_response("Plan my week")
+
+    for _ in range(breaker.failure_threshold + 1):
+        with pytest.raises(ModelTimeoutError):
+            asyncio.run(run())
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_rejected_request_is_not_degraded(fallback):
+    """Test that a 4xx raises ModelRequestError without fallback or breaker changes."""
+    fallback("cache,template")
+    response = httpx.Response(400, request=httpx.Request("POST", "https://example.invalid"))
+    error = APIStatusError("content filtered", response=response, body=None)
+    agent = make_agent('rejecting-deployment', FakeCompletions(error=error))
+    breaker = get_circuit_breaker('rejecting-deployment')
+    breaker.record_failure()
+
+    with pytest.raises(ModelRequestError) as excinfo:
+        asyncio.run(agent.get_response("How should I warm up?"))
+    assert excinfo.value.status_code == 400
+    assert breaker._failures == 1
+    assert agent.conversation_history == []